@@ -1,44 +1,189 @@
-import random, time
-import matplotlib.pyplot as plt
+import array
+import json
+import time
+import numpy as np
+
+_LCG_A, _LCG_C, _LCG_M = 1664525, 1013904223, 2**32
+_lcg_affine_cache = {}
+
+def _lcg_affine(iters):
+    # Compose iters LCG steps into one affine map x -> A*x + C (mod m) by
+    # map doubling. The textbook geometric-series form needs the inverse of
+    # a-1, which does not exist mod 2**32 (a-1 is even), so build C the
+    # same way as A instead.
+    A, C = 1, 0
+    a, c = _LCG_A, _LCG_C
+    k = iters
+    while k:
+        if k & 1:
+            A, C = (a * A) % _LCG_M, (a * C + c) % _LCG_M
+        a, c = (a * a) % _LCG_M, (a * c + c) % _LCG_M
+        k >>= 1
+    return A, C
 
 def heavy_postprocess(x, iters=1500):
-    # CPU-bound dummy work to emulate expensive step (e.g., model inference)
-    v = x
-    for _ in range(iters):
-        v = (v * 1664525 + 1013904223) % 2**32
-    return v
+    # Closed form of the LCG chain: identical result to iterating the
+    # recurrence, in O(log iters) once per iters value and O(1) after.
+    # Benchmarks that need the work to actually cost something use
+    # postprocess_all, which still runs the chain step by step.
+    try:
+        A, C = _lcg_affine_cache[iters]
+    except KeyError:
+        A, C = _lcg_affine_cache.setdefault(iters, _lcg_affine(iters))
+    return (A * int(x) + C) % _LCG_M
+
+try:
+    # AOT-compiled kernels (python build_ext.py): no JIT warmup at startup.
+    from fast_max import max_and_count_above, postprocess_all
+except ImportError:
+    from numba import njit, prange, uint32
+
+    @njit(cache=True)
+    def max_and_count_above(a, thr):
+        # Max and count of elements >= thr in one pass, with no candidate
+        # array materialized. m stays at the int64 sentinel when count is 0.
+        m = np.int64(-(2**63))
+        c = 0
+        for i in range(a.shape[0]):
+            if a[i] >= thr:
+                if a[i] > m:
+                    m = np.int64(a[i])
+                c += 1
+        return m, c
+
+    @njit(parallel=True, cache=True)
+    def postprocess_all(arr, iters):
+        # Each element's LCG chain is independent, so parallelize over elements.
+        n = arr.shape[0]
+        out = np.empty(n, np.uint32)
+        for i in prange(n):
+            v = uint32(arr[i])
+            for _ in range(iters):
+                v = uint32(v * uint32(1664525) + uint32(1013904223))
+            out[i] = v
+        return out
+
+    # Warm up the JIT once at import so compile time stays out of the timings.
+    max_and_count_above(np.ones(1, np.int32), 0.5)
+    postprocess_all(np.ones(1, np.int32), 1)
+
+_SWAR_HIGH = np.uint64(0x8000_8000_8000_8000)
+_SWAR_ONES = np.uint64(0x0001_0001_0001_0001)
+
+def threshold_count_only(arr, thr):
+    # Branchless SWAR count of elements >= thr for int16-range data
+    # (0 <= value < 2**15). Four lanes are packed per uint64; with the high
+    # bit of each lane forced on, a lane-wise subtract of thr cannot borrow
+    # into the neighbouring lane and leaves bit 15 set exactly when
+    # lane >= thr, so a popcount of the masked result is the survivor count.
+    # The demo's 1..1e6 values need int32, so this covers the count-only
+    # variant of cost_aware_scan when the data range allows it.
+    # Validate on the original values: casting first would wrap anything
+    # >= 2**15, and values >= 2**16 can wrap back to a plausible-looking
+    # non-negative int16 and silently produce a wrong count.
+    values = np.asarray(arr)
+    if values.size and (values.min() < 0 or values.max() >= 2**15):
+        raise ValueError("threshold_count_only needs values and thr in [0, 2**15)")
+    a = np.ascontiguousarray(values, dtype=np.int16)
+    thr = int(np.ceil(thr))
+    if thr <= 0:
+        return a.size
+    if thr >= 2**15:
+        raise ValueError("threshold_count_only needs values and thr in [0, 2**15)")
+    pad = (-a.size) % 4
+    if pad:
+        a = np.concatenate([a, np.zeros(pad, np.int16)])  # zeros never pass thr >= 1
+    lanes = a.view(np.uint64)
+    survivors = ((lanes | _SWAR_HIGH) - np.uint64(thr) * _SWAR_ONES) & _SWAR_HIGH
+    return int(np.bitwise_count(survivors).sum())
 
 def linear_scan(arr):
-    start = time.time()
-    _ = max(arr)
-    end = time.time()
-    return end - start
+    a = np.ascontiguousarray(arr, dtype=np.int32)  # zero-copy for conforming input
+    start = time.perf_counter_ns()
+    _ = a.max()
+    end = time.perf_counter_ns()
+    return (end - start) * 1e-9
 
 def cost_aware_scan(arr, threshold_ratio=0.8):
-    start = time.time()
-    upper = max(arr)
+    a = np.ascontiguousarray(arr, dtype=np.int32)  # zero-copy for conforming input
+    start = time.perf_counter_ns()
+    upper = a.max()
     thr = upper * threshold_ratio
-    candidates = [x for x in arr if x >= thr]
-    end = time.time()
-    return end - start, len(candidates)
+    _, count = max_and_count_above(a, thr)
+    end = time.perf_counter_ns()
+    return (end - start) * 1e-9, count
+
+def linear_scan_stdlib(arr):
+    # Zero-dependency variant for deployments where NumPy is off-limits:
+    # max() over an array.array('i') typed buffer walks a contiguous C int
+    # buffer instead of chasing a PyObject pointer per element.
+    a = array.array('i', arr)
+    start = time.perf_counter_ns()
+    _ = max(a)
+    end = time.perf_counter_ns()
+    return (end - start) * 1e-9
+
+def cost_aware_scan_stdlib(arr, threshold_ratio=0.8):
+    # Stdlib-only counterpart of cost_aware_scan; the filter stays a list
+    # comprehension since array.array has no vectorized compare.
+    a = array.array('i', arr)
+    start = time.perf_counter_ns()
+    upper = max(a)
+    thr = upper * threshold_ratio
+    candidates = [x for x in a if x >= thr]
+    end = time.perf_counter_ns()
+    return (end - start) * 1e-9, len(candidates)
 
 def linear_with_post(arr, post_iters=1500):
-    start = time.time()
-    _ = max(arr)
-    for x in arr:
-        heavy_postprocess(x, iters=post_iters)
-    end = time.time()
-    return end - start
+    a = np.ascontiguousarray(arr, dtype=np.int32)  # zero-copy for conforming input
+    start = time.perf_counter_ns()
+    _ = a.max()
+    postprocess_all(a, post_iters)
+    end = time.perf_counter_ns()
+    return (end - start) * 1e-9
 
 def cost_aware_with_post(arr, threshold_ratio=0.8, post_iters=1500):
-    start = time.time()
-    upper = max(arr)
+    a = np.ascontiguousarray(arr, dtype=np.int32)  # zero-copy for conforming input
+    start = time.perf_counter_ns()
+    upper = a.max()
     thr = upper * threshold_ratio
-    candidates = [x for x in arr if x >= thr]
-    for x in candidates:
-        heavy_postprocess(x, iters=post_iters)
-    end = time.time()
-    return end - start, len(candidates)
+    candidates = a[a >= thr]
+    postprocess_all(candidates, post_iters)
+    end = time.perf_counter_ns()
+    return (end - start) * 1e-9, candidates.size
+
+def postprocess_all_np(arr, iters):
+    # NumPy-only postprocess_all: one vectorized LCG step across every
+    # element per iteration, so the per-element Python overhead is gone and
+    # each step is a SIMD multiply-add; uint32 wraparound keeps the modulo
+    # free. Useful where the numba/AOT kernels are unavailable.
+    a = np.asarray(arr, dtype=np.uint32).copy()
+    for _ in range(iters):
+        a = a * np.uint32(1664525) + np.uint32(1013904223)
+    return a
+
+def linear_with_post_np(arr, post_iters=1500):
+    a = np.ascontiguousarray(arr, dtype=np.int32)  # zero-copy for conforming input
+    start = time.perf_counter_ns()
+    _ = a.max()
+    postprocess_all_np(a, post_iters)
+    end = time.perf_counter_ns()
+    return (end - start) * 1e-9
+
+def cost_aware_with_post_np(arr, threshold_ratio=0.8, post_iters=1500):
+    a = np.ascontiguousarray(arr, dtype=np.int32)  # zero-copy for conforming input
+    start = time.perf_counter_ns()
+    upper = a.max()
+    thr = upper * threshold_ratio
+    candidates = a[a >= thr]
+    postprocess_all_np(candidates, post_iters)
+    end = time.perf_counter_ns()
+    return (end - start) * 1e-9, candidates.size
+
+def best_of(fn, repeat):
+    # Min over repeats filters scheduler/frequency noise out of the timings.
+    results = [fn() for _ in range(repeat)]
+    return min(results, key=lambda r: r[0] if isinstance(r, tuple) else r)
 
 if __name__ == "__main__":
     sizes = [2_000, 5_000, 10_000, 20_000, 40_000]
@@ -46,34 +191,19 @@ if __name__ == "__main__":
     linp_times, cap_times = [], []
 
     for n in sizes:
-        data = [random.randint(1, 10**6) for _ in range(n)]
-        t_lin = linear_scan(data)
-        t_ca, s1 = cost_aware_scan(data, threshold_ratio=0.8)
-        t_linp = linear_with_post(data, post_iters=1500)
-        t_cap, s2 = cost_aware_with_post(data, threshold_ratio=0.8, post_iters=1500)
+        data = np.random.randint(1, 10**6 + 1, size=n, dtype=np.int32)
+        t_lin = best_of(lambda: linear_scan(data), repeat=7)
+        t_ca, s1 = best_of(lambda: cost_aware_scan(data, threshold_ratio=0.8), repeat=7)
+        t_linp = best_of(lambda: linear_with_post(data, post_iters=1500), repeat=3)
+        t_cap, s2 = best_of(lambda: cost_aware_with_post(data, threshold_ratio=0.8, post_iters=1500), repeat=3)
 
         lin_times.append(t_lin); ca_times.append(t_ca)
         linp_times.append(t_linp); cap_times.append(t_cap)
         print(f"n={n}: no-post linear={t_lin:.6f}s, cost-aware={t_ca:.6f}s | with-post linear={t_linp:.3f}s, cost-aware={t_cap:.3f}s")
 
-    # Plot 1: no post-processing
-    plt.figure(figsize=(7,5))
-    plt.plot(sizes, lin_times, marker='o', label='Linear Max (no post-processing)')
-    plt.plot(sizes, ca_times, marker='s', label='Cost-Aware (no post-processing)')
-    plt.xlabel('Input size (n)')
-    plt.ylabel('Execution time (seconds)')
-    plt.title('Timing without Post-Processing')
-    plt.legend(); plt.grid(True); plt.tight_layout()
-    plt.savefig('benchmark_no_post.png')
-
-    # Plot 2: with heavy post-processing
-    plt.figure(figsize=(7,5))
-    plt.plot(sizes, linp_times, marker='o', label='Linear Max (with heavy post-processing)')
-    plt.plot(sizes, cap_times, marker='s', label='Cost-Aware (with heavy post-processing)')
-    plt.xlabel('Input size (n)')
-    plt.ylabel('Execution time (seconds)')
-    plt.title('Timing with Heavy Post-Processing (threshold=0.8·max)')
-    plt.legend(); plt.grid(True); plt.tight_layout()
-    plt.savefig('benchmark_with_post.png')
-
-    print('Saved: benchmark_no_post.png, benchmark_with_post.png')
+    # Timings only; rendering lives in plot.py so measurement runs stay
+    # headless and repeatable without paying matplotlib's startup cost.
+    with open('bench.json', 'w') as f:
+        json.dump({'sizes': sizes, 'lin': lin_times, 'ca': ca_times,
+                   'linp': linp_times, 'cap': cap_times}, f)
+    print('Saved: bench.json (render with `python plot.py bench.json`)')
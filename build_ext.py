@@ -0,0 +1,43 @@
+"""Ahead-of-time compile the hot kernels into a `fast_max` extension.
+
+Run once:  python build_ext.py
+The benchmark scripts prefer fast_max when it has been built, which
+removes the JIT compile/warmup cost from process startup so one-shot
+runs are apples-to-apples. numba.pycc has no parallel target, so
+postprocess_all is exported as the serial loop; without fast_max the
+scripts fall back to the JIT kernels (postprocess_all with prange).
+"""
+
+import numpy as np
+from numba import uint32
+from numba.pycc import CC
+
+cc = CC("fast_max")
+
+
+@cc.export("max_and_count_above", "UniTuple(i8, 2)(i4[:], f8)")
+def max_and_count_above(a, thr):
+    m = np.int64(-(2**63))
+    c = 0
+    for i in range(a.shape[0]):
+        if a[i] >= thr:
+            if a[i] > m:
+                m = np.int64(a[i])
+            c += 1
+    return m, c
+
+
+@cc.export("postprocess_all", "u4[:](i4[:], i8)")
+def postprocess_all(arr, iters):
+    n = arr.shape[0]
+    out = np.empty(n, np.uint32)
+    for i in range(n):
+        v = uint32(arr[i])
+        for _ in range(iters):
+            v = uint32(v * uint32(1664525) + uint32(1013904223))
+        out[i] = v
+    return out
+
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,47 @@
+# cython: language_level=3
+"""Cython port of the fused upper-bound scan + threshold filter.
+
+Build in place with:  python setup.py build_ext --inplace
+The pure-Python entry points fall back to the numba kernel when this
+extension has not been built.
+"""
+
+import numpy as np
+
+cimport cython
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def scan(int[::1] a, double ratio):
+    """Return (max, candidates) for a contiguous int32 buffer.
+
+    Single-pass max, then a count pass and a fill pass into a
+    right-sized int32 array of the elements >= max * ratio.
+    """
+    cdef Py_ssize_t n = a.shape[0]
+    cdef Py_ssize_t i, j = 0, count = 0
+    cdef long m
+    cdef double thr
+
+    if n == 0:
+        raise ValueError("scan needs a non-empty array")
+    m = a[0]
+
+    for i in range(n):
+        if a[i] > m:
+            m = a[i]
+    thr = m * ratio
+
+    for i in range(n):
+        if a[i] >= thr:
+            count += 1
+
+    out = np.empty(count, dtype=np.int32)
+    cdef int[::1] ov = out
+    for i in range(n):
+        if a[i] >= thr:
+            ov[j] = a[i]
+            j += 1
+
+    return m, out
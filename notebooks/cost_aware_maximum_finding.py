@@ -9,6 +9,8 @@ import argparse
 import random
 from time import perf_counter
 
+import numpy as np
+
 try:
     import matplotlib.pyplot as plt
 except Exception:
@@ -17,28 +19,103 @@ except Exception:
 
 # ---------- Core utilities ----------
 
+_LCG_A, _LCG_C, _LCG_M = 1664525, 1013904223, 2**32
+_lcg_affine_cache: dict = {}
+
+
+def _lcg_affine(iters: int):
+    """Compose iters LCG steps into one affine map x -> A*x + C (mod m).
+
+    Built by map doubling; the geometric-series closed form would need
+    the inverse of a-1, which does not exist mod 2**32 (a-1 is even).
+    """
+    A, C = 1, 0
+    a, c = _LCG_A, _LCG_C
+    k = iters
+    while k:
+        if k & 1:
+            A, C = (a * A) % _LCG_M, (a * C + c) % _LCG_M
+        a, c = (a * a) % _LCG_M, (a * c + c) % _LCG_M
+        k >>= 1
+    return A, C
+
+
 def heavy_postprocess(x: int, iters: int = 1500) -> int:
-    """CPU-bound dummy work to simulate an expensive step (e.g., model inference)."""
-    v = x
-    for _ in range(iters):
-        v = (v * 1664525 + 1013904223) % (2**32)
-    return v
+    """Closed form of the LCG chain: same result as iterating, O(1) cached.
+
+    postprocess_all keeps running the chain step by step, since the
+    benchmarks use it precisely to simulate per-candidate cost.
+    """
+    try:
+        A, C = _lcg_affine_cache[iters]
+    except KeyError:
+        A, C = _lcg_affine_cache.setdefault(iters, _lcg_affine(iters))
+    return (A * int(x) + C) % _LCG_M
+
+
+try:
+    # AOT-compiled kernels (python build_ext.py at the repo root): no JIT
+    # warmup at startup.
+    from fast_max import max_and_count_above, postprocess_all
+except ImportError:
+    from numba import njit, prange, uint32
+
+    @njit(cache=True)
+    def max_and_count_above(a, thr):
+        """One-pass max and count of elements >= thr; no candidate array.
+
+        m stays at the int64 sentinel when nothing survives (count == 0).
+        """
+        m = np.int64(-(2**63))
+        c = 0
+        for i in range(a.shape[0]):
+            if a[i] >= thr:
+                if a[i] > m:
+                    m = np.int64(a[i])
+                c += 1
+        return m, c
+
+    @njit(parallel=True, cache=True)
+    def postprocess_all(arr, iters):
+        """Run heavy_postprocess over every element, parallelized across cores.
+
+        Each element's LCG chain is independent, so the loop is embarrassingly
+        parallel.
+        """
+        n = arr.shape[0]
+        out = np.empty(n, np.uint32)
+        for i in prange(n):
+            v = uint32(arr[i])
+            for _ in range(iters):
+                v = uint32(v * uint32(1664525) + uint32(1013904223))
+            out[i] = v
+        return out
+
+    # Warm up the JIT once at import so compile time stays out of the timings.
+    max_and_count_above(np.ones(1, np.int32), 0.5)
+    postprocess_all(np.ones(1, np.int32), 1)
 
 
 def linear_scan(arr):
     """One-pass max (baseline). Returns (max_value, elapsed_seconds)."""
+    a = np.ascontiguousarray(arr, dtype=np.int32)  # zero-copy for conforming input
     t0 = perf_counter()
-    m = max(arr)
+    m = int(a.max())
     t1 = perf_counter()
     return m, (t1 - t0)
 
 
 def estimate_upper_bound_by_sample(arr, sample_size: int):
-    """Return an upper-bound estimate using a uniform random sample."""
-    if sample_size <= 0 or sample_size >= len(arr):
-        return max(arr)
-    sample = random.sample(arr, sample_size)
-    return max(sample)
+    """Return an upper-bound estimate using a uniform random sample.
+
+    Samples with replacement via index lookup: O(sample_size), no
+    Python-object traffic, and just as good for a max estimate.
+    """
+    a = np.asarray(arr)
+    if sample_size <= 0 or sample_size >= a.shape[0]:
+        return int(a.max())
+    idx = np.random.randint(0, a.shape[0], sample_size)
+    return int(a[idx].max())
 
 
 def cost_aware_max(
@@ -58,6 +135,7 @@ def cost_aware_max(
 
     Returns (max_over_candidates, num_candidates, elapsed_seconds).
     """
+    a = np.ascontiguousarray(arr, dtype=np.int32)  # zero-copy for conforming input
     t0 = perf_counter()
 
     # 1) upper bound
@@ -66,22 +144,24 @@ def cost_aware_max(
     elif sample_size > 0:
         upper = estimate_upper_bound_by_sample(arr, sample_size)
     else:
-        upper = max(arr)  # full pass
+        upper = int(a.max())  # full pass
 
-    # 2) filter candidates
     thr = upper * threshold_ratio
-    candidates = [x for x in arr if x >= thr]
 
-    # 3) optional heavy post-processing on candidates only
     if post_iters > 0:
-        for x in candidates:
-            heavy_postprocess(x, iters=post_iters)
-
-    # 4) compute max among candidates (if any)
-    m = max(candidates) if candidates else None
+        # 2) materialize candidates only when post-processing needs them
+        candidates = a[a >= thr]
+        postprocess_all(candidates, post_iters)
+        m = int(candidates.max()) if candidates.size else None
+        count = int(candidates.size)
+    else:
+        # 2') common case: only max + count are needed, so skip the
+        # candidate array entirely
+        cm, count = max_and_count_above(a, thr)
+        m = int(cm) if count else None
 
     t1 = perf_counter()
-    return m, len(candidates), (t1 - t0)
+    return m, count, (t1 - t0)
 
 
 # ---------- CLI ----------
@@ -109,9 +189,10 @@ def main():
     args = ap.parse_args()
 
     random.seed(args.seed)
+    np.random.seed(args.seed)
 
-    # Generate synthetic data
-    data = [random.randint(1, 10**6) for _ in range(args.n)]
+    # Generate synthetic data (one C call, contiguous int32 buffer)
+    data = np.random.randint(1, 10**6 + 1, size=args.n, dtype=np.int32)
 
     # Baseline
     if args.compare:
@@ -146,7 +227,7 @@ def main():
         sizes = sorted(set(s for s in sizes if s is not None and s > 0))
         lin_ts, ca_ts = [], []
         for n in sizes:
-            data = [random.randint(1, 10**6) for _ in range(n)]
+            data = np.random.randint(1, 10**6 + 1, size=n, dtype=np.int32)
             if args.compare:
                 _, t_lin = linear_scan(data)
                 lin_ts.append(t_lin)
@@ -0,0 +1,67 @@
+"""Render plots from benchmark artifacts (bench.json / bench.npz).
+
+The benchmark scripts only write timing artifacts; matplotlib is
+imported here and nowhere else, so measurement runs stay headless and
+fast and the plots can be regenerated without re-measuring.
+
+Usage:
+    python plot.py [bench.json | bench.npz]
+"""
+
+import json
+import sys
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+
+def plot_bench_json(path="bench.json"):
+    """Render the no-post / with-post figure pair from benchmark.py."""
+    with open(path) as f:
+        d = json.load(f)
+    sizes = d["sizes"]
+
+    plt.figure(figsize=(7, 5))
+    plt.plot(sizes, d["lin"], marker="o", label="Linear Max (no post-processing)")
+    plt.plot(sizes, d["ca"], marker="s", label="Cost-Aware (no post-processing)")
+    plt.xlabel("Input size (n)")
+    plt.ylabel("Execution time (seconds)")
+    plt.title("Timing without Post-Processing")
+    plt.legend(); plt.grid(True); plt.tight_layout()
+    plt.savefig("benchmark_no_post.png")
+
+    plt.figure(figsize=(7, 5))
+    plt.plot(sizes, d["linp"], marker="o", label="Linear Max (with heavy post-processing)")
+    plt.plot(sizes, d["cap"], marker="s", label="Cost-Aware (with heavy post-processing)")
+    plt.xlabel("Input size (n)")
+    plt.ylabel("Execution time (seconds)")
+    plt.title("Timing with Heavy Post-Processing (threshold=0.8·max)")
+    plt.legend(); plt.grid(True); plt.tight_layout()
+    plt.savefig("benchmark_with_post.png")
+
+    print("Saved: benchmark_no_post.png, benchmark_with_post.png")
+
+
+def plot_bench_npz(path="bench.npz", threshold=0.8):
+    """Render the linear-vs-cost-aware figure from run_benchmark's npz."""
+    d = np.load(path)
+    plt.figure(figsize=(8, 5))
+    plt.plot(d["sizes"], d["linear"], "o-", label="Linear Max")
+    plt.plot(d["sizes"], d["cost_aware"], "s-", label="Cost-Aware Max")
+    plt.xlabel("Input size (n)")
+    plt.ylabel("Execution time (seconds)")
+    plt.title(f"Benchmark: Linear vs Cost-Aware (threshold={threshold}·max)")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig("demo_plot.png")
+    print("Saved: demo_plot.png")
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "bench.json"
+    if path.endswith(".npz"):
+        plot_bench_npz(path)
+    else:
+        plot_bench_json(path)
@@ -0,0 +1,7 @@
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="cost_aware",
+    ext_modules=cythonize("cost_aware.pyx", language_level=3),
+)